@@ -1,12 +1,18 @@
 
 # dashboards/streamlit_app.py
 
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import snowflake.connector
-from datetime import date  # for date_input
+from tsdownsample import LTTBDownsampler
+from datetime import date, timedelta  # for date_input
 
 # 1) Page config
 st.set_page_config(page_title="Stocks — Actuals & Forecast", layout="wide")
@@ -16,10 +22,9 @@ if "snowflake" not in st.secrets:
     st.error("Missing [snowflake] secrets in Streamlit Cloud. Go to Settings → Secrets.")
     st.stop()
 
-# 3) Connection as a cached *resource* (hash-safe)
-@st.cache_resource
-def get_conn():
-    sf = st.secrets["snowflake"]
+# 3) Small pool of connections as a cached *resource* (hash-safe), so concurrent
+#    sessions don't queue behind one connection. Size it to the warehouse.
+def _connect(sf: dict):
     return snowflake.connector.connect(
         account=sf["account"],
         user=sf["user"],
@@ -28,15 +33,53 @@ def get_conn():
         database=sf["database"],
         schema=sf["schema"],
         role=sf.get("role", None),
+        # Download result chunks in parallel and keep pooled sessions from expiring
+        client_prefetch_threads=8,
+        client_session_keep_alive=True,
+        # Set at login rather than via ALTER SESSION, which would cost an extra round-trip
+        session_parameters={"PYTHON_CONNECTOR_QUERY_RESULT_FORMAT": "ARROW"},
     )
 
-conn = get_conn()
+@st.cache_resource
+def get_pool() -> tuple[queue.Queue, dict]:
+    """(pool, credentials): the credentials are captured here so workers never touch st.secrets."""
+    sf = dict(st.secrets["snowflake"])
+    pool_size = max(1, int(sf.get("pool_size", 4)))  # maxsize <= 0 would mean an unbounded, slotless queue
+    pool = queue.Queue(maxsize=pool_size)
+    for _ in range(pool_size):
+        pool.put(None)  # slots connect lazily on first use
+    return pool, sf
+
+POOL_TIMEOUT = 30  # seconds to wait for a free connection before giving up
+
+# Set on prefetch threads: speculative work never waits for (or errors on) a busy pool
+_speculative = threading.local()
+
+@contextmanager
+def pooled_conn(pool_handle: tuple[queue.Queue, dict]):
+    """Borrow a connection from the pool (as returned by get_pool) for the duration of the block."""
+    pool, sf = pool_handle
+    speculative = getattr(_speculative, "active", False)
+    try:
+        conn = pool.get(block=not speculative, timeout=POOL_TIMEOUT)
+    except queue.Empty:
+        if speculative:
+            raise
+        st.error("All Snowflake connections are busy. Please try again in a moment.")
+        st.stop()
+    try:
+        if conn is None or conn.is_closed():
+            conn = _connect(sf)
+        yield conn
+    finally:
+        pool.put(conn)
 
 # === Snowflake object names based on your SQL ===
 DB = "SNOWFLAKE_LEARNING_DB"
 SCHEMA = "PUBLIC"
 ACTUALS_TABLE = f"{DB}.{SCHEMA}.STOCK_SILVER"     # SNOWFLAKE_LEARNING_DB.PUBLIC.STOCK_SILVER
 FORECAST_TABLE = f"{DB}.{SCHEMA}.STOCK_FORECAST"  # SNOWFLAKE_LEARNING_DB.PUBLIC.STOCK_FORECAST
+META_TABLE = f"{DB}.{SCHEMA}.SYMBOLS_META"        # per-symbol counts + date bounds (see infra/pipeline_setup.sql)
 
 # Column names in actuals table
 DATE_COL = "DT"
@@ -44,232 +87,392 @@ CLOSE_COL = "CLOSE"
 SYMBOL_COL = "SYMBOL"
 
 # ---------- Cached helpers ----------
-@st.cache_data(ttl=600)
-def list_symbols_union() -> list[str]:
+RESULT_CACHE_TTL = 600       # seconds
+META_CACHE_TTL = 3600        # SYMBOLS_META only refreshes daily
+RESULT_CACHE_MAX_ENTRIES = 64
+
+@st.cache_resource
+def _result_store() -> tuple[OrderedDict, threading.Lock]:
+    """Process-wide LRU of query results, shared by every session (no pickling on hit)."""
+    return OrderedDict(), threading.Lock()
+
+def _resources() -> tuple:
     """
-    Return the union of symbols present in ACTUALS and FORECAST,
-    so the dropdown shows any ticker that has either history or forecast.
+    The st.cache_resource handles cached_sql needs. Resolve these on the script thread
+    and pass them to background workers, which must not make Streamlit calls.
     """
-    sql = f"""
-    SELECT SYMBOL FROM (
-      SELECT DISTINCT {SYMBOL_COL} AS SYMBOL FROM {ACTUALS_TABLE}
-      UNION
-      SELECT DISTINCT SYMBOL FROM {FORECAST_TABLE}
-    )
-    WHERE SYMBOL IS NOT NULL
-    ORDER BY SYMBOL
+    return _result_store(), get_pool()
+
+def cached_sql(
+    sql: str,
+    params: dict | None = None,
+    dtype: dict | None = None,
+    ttl: float = RESULT_CACHE_TTL,
+    transform=None,
+    resources: tuple | None = None,
+):
+    """
+    Run `sql` and return the result as a DataFrame, memoized on (sql, params) for `ttl` seconds.
+    `dtype` and then `transform` (if given, its return value is cached instead) are applied once,
+    before caching, so a hit returns the very same object until the query is refetched.
+    Returned frames are shared across sessions, so callers must not mutate them.
+    `resources` (from _resources()) is required when calling off the script thread.
+    """
+    key = (sql, tuple(sorted((params or {}).items())))
+    (store, lock), pool_handle = resources or _resources()
+    now = time.monotonic()
+    with lock:
+        hit = store.get(key)
+        if hit is not None and now - hit[0] < ttl:
+            store.move_to_end(key)
+            return hit[1]
+
+    with pooled_conn(pool_handle) as conn, conn.cursor() as cur:
+        cur.execute(sql, params)
+        df = cur.fetch_pandas_all()
+    if dtype and not df.empty:
+        df = df.astype(dtype)
+    if transform is not None:
+        df = transform(df)
+
+    with lock:
+        store[key] = (now, df)
+        store.move_to_end(key)
+        while len(store) > RESULT_CACHE_MAX_ENTRIES:
+            store.popitem(last=False)
+    return df
+
+def load_symbols_meta() -> pd.DataFrame:
+    """
+    Per-symbol (SRC, SYMBOL, N, MIN_DS, MAX_DS) from the pre-aggregated SYMBOLS_META table.
+    Drives the symbol dropdown, the date-picker bounds and the coverage debug panel.
     """
-    cur = conn.cursor()
-    cur.execute(sql)
-    symbols = [row[0] for row in cur.fetchall()]
-    cur.close()
-    # Normalize to uppercase & trimmed
-    symbols = sorted({(s or "").strip().upper() for s in symbols if s})
-    return symbols
-
-@st.cache_data(ttl=600)
-def load_forecast(symbol: str) -> pd.DataFrame:
     sql = f"""
-        SELECT 
-            TRY_TO_DATE(DS) AS DS,
-            TRY_TO_DOUBLE(YHAT) AS YHAT,
-            SYMBOL,
-            TRY_TO_DOUBLE(YHAT_LOWER) AS YHAT_LOWER,
-            TRY_TO_DOUBLE(YHAT_UPPER) AS YHAT_UPPER
-        FROM {FORECAST_TABLE}
-        WHERE SYMBOL = %(symbol)s
-        ORDER BY DS
+    SELECT SRC, SYMBOL, N, MIN_DS, MAX_DS
+    FROM {META_TABLE}
+    WHERE SYMBOL IS NOT NULL
+    ORDER BY SYMBOL, SRC
     """
-    cur = conn.cursor()
-    cur.execute(sql, {"symbol": (symbol or "").strip().upper()})
-    rows = cur.fetchall()
-    cur.close()
-    df = pd.DataFrame(rows, columns=["DS", "YHAT", "SYMBOL", "YHAT_LOWER", "YHAT_UPPER"])
+    return cached_sql(sql, dtype={"SRC": "category", "SYMBOL": "category"}, ttl=META_CACHE_TTL)
+
+ACTUAL_DTYPES = {"DS": "datetime64[ns]", "CLOSE": "float64"}
+FORECAST_DTYPES = {"DS": "datetime64[ns]", "YHAT": "float64", "YHAT_LOWER": "float64", "YHAT_UPPER": "float64"}
+
+def _split_series(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Split the SRC-tagged series result into (actuals, forecast) frames."""
+    actual_cols = list(ACTUAL_DTYPES)
+    forecast_cols = list(FORECAST_DTYPES)
     if df.empty:
-        return df
-    df["DS"] = pd.to_datetime(df["DS"], errors="coerce")
-    df["YHAT"] = pd.to_numeric(df["YHAT"], errors="coerce")
-    for c in ["YHAT_LOWER", "YHAT_UPPER"]:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-    return df.dropna(subset=["DS", "YHAT"])
-
-@st.cache_data(ttl=600)
-def load_actuals(symbol: str) -> pd.DataFrame:
+        # Typed empties, so downstream numeric ops (round/astype) behave like the non-empty path
+        return (
+            pd.DataFrame(columns=actual_cols).astype(ACTUAL_DTYPES),
+            pd.DataFrame(columns=forecast_cols).astype(FORECAST_DTYPES),
+        )
+
+    # Rows come back ORDER BY SRC, so each source is one contiguous block
+    split = int(df["SRC"].searchsorted("F", side="left"))
+    df_a = df.iloc[:split].rename(columns={"V": "CLOSE"})[actual_cols].reset_index(drop=True)
+    df_f = df.iloc[split:].rename(columns={"V": "YHAT"})[forecast_cols].reset_index(drop=True)
+    return df_a, df_f
+
+def load_series(
+    symbol: str, start: date, end: date, resources: tuple | None = None
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Fetch actuals and forecast for one symbol in a single round-trip.
+    Rows are tagged with SRC ('A' = actuals, 'F' = forecast) and split once, before caching,
+    so repeat calls return the same shared frames until the result is refetched.
+    """
     sql = f"""
-        SELECT 
-            TRY_TO_DATE({DATE_COL}) AS DS,
-            TRY_TO_DOUBLE({CLOSE_COL}) AS CLOSE,
-            {SYMBOL_COL} AS SYMBOL
+        SELECT
+            'A' AS SRC,
+            {DATE_COL}::TIMESTAMP_NTZ AS DS,
+            {CLOSE_COL} AS V,
+            NULL::FLOAT AS YHAT_LOWER,
+            NULL::FLOAT AS YHAT_UPPER
         FROM {ACTUALS_TABLE}
         WHERE {SYMBOL_COL} = %(symbol)s
-        ORDER BY {DATE_COL}
+          AND {DATE_COL} BETWEEN %(start)s AND %(end)s
+          AND {CLOSE_COL} IS NOT NULL
+        UNION ALL
+        SELECT
+            'F' AS SRC,
+            DS::TIMESTAMP_NTZ AS DS,
+            YHAT AS V,
+            YHAT_LOWER,
+            YHAT_UPPER
+        FROM {FORECAST_TABLE}
+        WHERE SYMBOL = %(symbol)s
+          AND DS BETWEEN %(start)s AND %(end)s
+          AND YHAT IS NOT NULL
+        ORDER BY SRC, DS
+    """
+    # Arrow fetch: source columns are DATE/FLOAT (see infra/pipeline_setup.sql), so no per-row casts
+    return cached_sql(
+        sql,
+        {"symbol": (symbol or "").strip().upper(), "start": start, "end": end},
+        transform=_split_series,
+        resources=resources,
+    )
+
+def symbol_bounds(meta: pd.DataFrame, symbol: str) -> tuple[date, date] | None:
+    """(min_date, max_date) across actuals + forecast for `symbol`, or None if it has no data."""
+    sym_meta = meta[meta["SYMBOL"] == symbol]
+    min_ds, max_ds = sym_meta["MIN_DS"].min(), sym_meta["MAX_DS"].max()
+    if pd.isna(min_ds) or pd.isna(max_ds):
+        return None
+    return pd.to_datetime(min_ds).date(), pd.to_datetime(max_ds).date()
+
+DEFAULT_RANGE_DAYS = 365
+
+def default_range(min_date: date, max_date: date) -> tuple[date, date]:
+    """Initial date-picker window: the most recent year of data, so the first query stays small."""
+    return max(min_date, max_date - timedelta(days=DEFAULT_RANGE_DAYS)), max_date
+
+def prefetch_series(requests: list[tuple[str, date, date]], prefetched: dict) -> None:
+    """
+    Warm the result cache for likely next selections on a background thread.
+    Speculative only: a failed warm-up (busy pool, query error) is dropped from
+    `prefetched` so the next rerun retries it; a successful one is stamped with its finish time.
+    """
+    # Resolved here, on the script thread: the worker makes no Streamlit calls
+    resources = _resources()
+
+    def _warm():
+        _speculative.active = True
+        for args in requests:
+            try:
+                load_series(*args, resources=resources)
+            except Exception:
+                prefetched.pop(args, None)
+            else:
+                prefetched[args] = time.monotonic()
+
+    threading.Thread(target=_warm, daemon=True).start()
+
+
+# ---------- Plot helpers ----------
+MAX_PLOT_POINTS = 2000
+
+# Layout shared by every figure; each chart only adds its title/axis label
+BASE_LAYOUT = dict(template="plotly_dark", xaxis_title="Date")
+
+def lttb_downsample(df: pd.DataFrame, y_col: str, n_out: int = MAX_PLOT_POINTS) -> pd.DataFrame:
+    """
+    Largest-Triangle-Three-Buckets downsample of a DS-sorted frame.
+    Keeps the visual shape of the series while capping the points sent to Plotly.
     """
-    cur = conn.cursor()
-    cur.execute(sql, {"symbol": (symbol or "").strip().upper()})
-    rows = cur.fetchall()
-    cur.close()
-    df = pd.DataFrame(rows, columns=["DS", "CLOSE", "SYMBOL"])
+    if len(df) <= n_out or n_out < 3:
+        return df
+    idx = LTTBDownsampler().downsample(
+        df["DS"].to_numpy().astype("int64"),
+        df[y_col].to_numpy(dtype="float64"),
+        n_out=n_out,
+    )
+    return df.iloc[idx]
+
+def quantize_prices(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
+    """Round prices to cents and downcast to float32 to shrink the Plotly payload."""
     if df.empty:
         return df
-    df["DS"] = pd.to_datetime(df["DS"], errors="coerce")
-    df["CLOSE"] = pd.to_numeric(df["CLOSE"], errors="coerce")
-    return df.dropna(subset=["DS", "CLOSE"])
+    return df.assign(**{c: df[c].round(2).astype("float32") for c in cols if c in df.columns})
 
-@st.cache_data(ttl=600)
-def symbol_counts() -> pd.DataFrame:
-    """(Optional debug) Counts per symbol in each table."""
-    sql = f"""
-    SELECT 'ACTUALS' AS SRC, {SYMBOL_COL} AS SYMBOL, COUNT(*) AS N
-    FROM {ACTUALS_TABLE}
-    GROUP BY 1,2
-    UNION ALL
-    SELECT 'FORECAST' AS SRC, SYMBOL, COUNT(*) AS N
-    FROM {FORECAST_TABLE}
-    GROUP BY 1,2
-    ORDER BY SYMBOL, SRC
+def build_figures(symbol: str, df_actuals: pd.DataFrame, df_forecast: pd.DataFrame) -> dict:
+    """
+    Build the overlay and forecast figures (plus the actuals line series) for one (symbol, range).
+    "actuals"/"forecast" are None when there is nothing to plot.
+    """
+    # Nothing in range: empty overlay, and the panels show their "no data" info boxes
+    if df_actuals.empty and df_forecast.empty:
+        fig_overlay = go.Figure()
+        fig_overlay.update_layout(**BASE_LAYOUT, title=f"Actual vs Forecast — {symbol}", yaxis_title="Price")
+        return {"overlay": fig_overlay, "actuals": None, "forecast": None}
+
+    # Downsampled copies for charting only (row counts/debug still use the full frames)
+    df_actuals_plot = quantize_prices(lttb_downsample(df_actuals, "CLOSE"), ["CLOSE"])
+    df_forecast_plot = quantize_prices(
+        lttb_downsample(df_forecast, "YHAT"), ["YHAT", "YHAT_LOWER", "YHAT_UPPER"]
+    )
+
+    # Overlay chart (shows whichever is available)
+    fig_overlay = go.Figure()
+    if not df_actuals.empty:
+        fig_overlay.add_trace(go.Scatter(
+            x=df_actuals_plot["DS"], y=df_actuals_plot["CLOSE"],
+            mode="lines", name="Actual Close",
+            line=dict(color="#F72585", width=2)
+        ))
+    if not df_forecast.empty:
+        fig_overlay.add_trace(go.Scatter(
+            x=df_forecast_plot["DS"], y=df_forecast_plot["YHAT"],
+            mode="lines", name="Forecast",
+            line=dict(color="#4CC9F0", width=2, dash="dot")
+        ))
+    fig_overlay.update_layout(
+        **BASE_LAYOUT,
+        title=f"Actual vs Forecast — {symbol}",
+        yaxis_title="Price",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    # Actuals panel is a plain line, rendered natively by st.line_chart (no Plotly figure)
+    actuals_line = None if df_actuals.empty else df_actuals_plot.set_index("DS")["CLOSE"]
+
+    fig_forecast = None
+    if not df_forecast.empty:
+        fig_forecast = go.Figure()
+
+        # Optional: prediction interval band (upper must be added right before lower for "tonexty"),
+        # skipped when the bounds are all NULL so no empty WebGL traces are emitted
+        if df_forecast_plot["YHAT_LOWER"].notna().any() and df_forecast_plot["YHAT_UPPER"].notna().any():
+            fig_forecast.add_trace(go.Scattergl(
+                x=df_forecast_plot["DS"], y=df_forecast_plot["YHAT_UPPER"], mode="lines",
+                line=dict(color="rgba(76,201,240,0)"),
+                showlegend=False, hoverinfo="skip"
+            ))
+            fig_forecast.add_trace(go.Scattergl(
+                x=df_forecast_plot["DS"], y=df_forecast_plot["YHAT_LOWER"], mode="lines",
+                fill="tonexty", fillcolor="rgba(76,201,240,0.15)",
+                line=dict(color="rgba(76,201,240,0)"),
+                name="Forecast band"
+            ))
+
+        fig_forecast.add_trace(go.Scattergl(
+            x=df_forecast_plot["DS"], y=df_forecast_plot["YHAT"],
+            mode="lines", name="Forecast",
+            line=dict(color="#4CC9F0", width=2)
+        ))
+        fig_forecast.update_layout(
+            **BASE_LAYOUT, title=f"Forecast — {symbol}", yaxis_title="Predicted Close"
+        )
+
+    return {"overlay": fig_overlay, "actuals": actuals_line, "forecast": fig_forecast}
+
+FIG_CACHE_MAX_ENTRIES = 8
+
+def session_figures(key: tuple, data: tuple, build) -> dict:
+    """
+    Per-session LRU of built figures keyed by (symbol, start, end), so reruns
+    triggered by unrelated widgets skip figure construction entirely.
+    An entry is only reused while it was built from the very same `data` objects;
+    once cached_sql refetches, the frames change and the figures are rebuilt.
     """
-    cur = conn.cursor()
-    cur.execute(sql)
-    rows = cur.fetchall()
-    cur.close()
-    return pd.DataFrame(rows, columns=["SRC", "SYMBOL", "N"])
+    cache = st.session_state.setdefault("_fig_cache", OrderedDict())
+    hit = cache.get(key)
+    if hit is not None and len(hit[0]) == len(data) and all(a is b for a, b in zip(hit[0], data)):
+        cache.move_to_end(key)
+        return hit[1]
+    figs = build()
+    cache[key] = (data, figs)
+    while len(cache) > FIG_CACHE_MAX_ENTRIES:
+        cache.popitem(last=False)
+    return figs
 
 
 # ---------- Sidebar: symbol + date range ----------
-symbols = list_symbols_union()
+meta = load_symbols_meta()
+symbols = sorted(meta["SYMBOL"].unique()) if not meta.empty else []
 if not symbols:
     st.error("No symbols found in either actuals or forecast tables. Verify your pipeline loaded data.")
     st.stop()
 
 symbol = st.sidebar.selectbox("Symbol", options=symbols, index=0)
 
-# Load both datasets once for THIS symbol to compute min/max bounds
-df_actuals_all = load_actuals(symbol)
-df_forecast_all = load_forecast(symbol)
-
-# Union of dates across actuals + forecast for the selected symbol
-dates_all = pd.concat(
-    [
-        df_actuals_all[["DS"]] if not df_actuals_all.empty else pd.DataFrame(columns=["DS"]),
-        df_forecast_all[["DS"]] if not df_forecast_all.empty else pd.DataFrame(columns=["DS"]),
-    ],
-    ignore_index=True,
-).dropna()
-
-if dates_all.empty:
+# Date bounds for THIS symbol, read from the cached metadata (no extra query)
+bounds = symbol_bounds(meta, symbol)
+if bounds is None:
     st.warning(f"No data (actuals or forecast) available for '{symbol}'. Try another symbol.")
     st.stop()
 
-min_date = pd.to_datetime(dates_all["DS"].min()).date()
-max_date = pd.to_datetime(dates_all["DS"].max()).date()
+min_date, max_date = bounds
 
-# Date range input (returns datetime.date objects)
+# Date range input (returns datetime.date objects); widen it to see older history.
+# Keyed per symbol so switching symbols always starts from that symbol's default range.
 selected_range = st.sidebar.date_input(
     "Date range",
-    (min_date, max_date),
+    default_range(min_date, max_date),
     min_value=min_date,
     max_value=max_date,
+    key=f"date_range_{symbol}",
 )
 
 # Handle single-date or range selection
 if isinstance(selected_range, tuple) and len(selected_range) == 2:
     start_date, end_date = selected_range
+elif isinstance(selected_range, tuple):
+    # Mid-selection the widget returns a 1-tuple; treat it as a single day
+    start_date = end_date = selected_range[0]
 else:
     start_date = selected_range
     end_date = selected_range
 
-# Convert to Timestamps for filtering
-start_ts = pd.Timestamp(start_date)
-end_ts   = pd.Timestamp(end_date)
+show_forecast_debug = st.sidebar.checkbox("Show forecast debug", value=False)
 
-# Filtered frames for plotting
-df_actuals = df_actuals_all[(df_actuals_all["DS"] >= start_ts) & (df_actuals_all["DS"] <= end_ts)]
-df_forecast = df_forecast_all[(df_forecast_all["DS"] >= start_ts) & (df_forecast_all["DS"] <= end_ts)]
+# Filtered frames for plotting (range is pushed down into Snowflake and each
+# (symbol, start, end) result is memoized, so revisiting a range is served from cache)
+df_actuals, df_forecast = load_series(symbol, start_date, end_date)
+
+figs = session_figures(
+    (symbol, start_date, end_date),
+    (df_actuals, df_forecast),
+    lambda: build_figures(symbol, df_actuals, df_forecast),
+)
 
 
 # ---------- Main body ----------
 st.header("📈 Stocks — Actuals & Forecast")
 
-# Overlay chart (shows whichever is available)
-fig_overlay = go.Figure()
-if not df_actuals.empty:
-    fig_overlay.add_trace(go.Scatter(
-        x=df_actuals["DS"], y=df_actuals["CLOSE"],
-        mode="lines", name="Actual Close",
-        line=dict(color="#F72585", width=2)
-    ))
-if not df_forecast.empty:
-    fig_overlay.add_trace(go.Scatter(
-        x=df_forecast["DS"], y=df_forecast["YHAT"],
-        mode="lines", name="Forecast",
-        line=dict(color="#4CC9F0", width=2, dash="dot")
-    ))
-
-fig_overlay.update_layout(
-    title=f"Actual vs Forecast — {symbol}",
-    template="plotly_dark",
-    xaxis_title="Date",
-    yaxis_title="Price",
-    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-)
-st.plotly_chart(fig_overlay, use_container_width=True)
+st.plotly_chart(figs["overlay"], use_container_width=True, key="overlay")
 
 col1, col2 = st.columns(2)
 
 with col1:
     st.subheader(f"Actual Close — {symbol}")
     st.caption(f"Actual rows in range: {len(df_actuals)}")
-    if df_actuals.empty:
+    if figs["actuals"] is None:
         st.info(f"No actuals for '{symbol}' in the selected date range.")
     else:
-        fig_actuals = px.line(df_actuals, x="DS", y="CLOSE", title=f"Actual Close — {symbol}")
-        fig_actuals.update_traces(line=dict(color="#F72585", width=2), opacity=1.0)
-        fig_actuals.update_layout(template="plotly_dark", xaxis_title="Date", yaxis_title="Close")
-        st.plotly_chart(fig_actuals, use_container_width=True)
+        st.line_chart(figs["actuals"], color="#F72585", x_label="Date", y_label="Close")
 
 with col2:
     st.subheader(f"Forecast — {symbol}")
-    with st.expander("Debug (forecast)", expanded=False):
-        st.caption(f"Forecast rows in range: {len(df_forecast)}")
-        st.write("Sample forecast rows:", df_forecast.head(5))
-        st.write("Dtypes:", df_forecast.dtypes.to_dict())
-        st.write("NaN counts:", df_forecast.isna().sum().to_dict())
-
-    if df_forecast.empty or df_forecast["YHAT"].isna().all():
+    # Expander bodies run on every rerun even when collapsed, so gate the summaries
+    if show_forecast_debug:
+        with st.expander("Debug (forecast)", expanded=True):
+            st.caption(f"Forecast rows in range: {len(df_forecast)}")
+            st.write("Sample forecast rows:", df_forecast.head(5))
+            st.write("Dtypes:", df_forecast.dtypes.to_dict())
+            st.write("NaN counts:", df_forecast.isna().sum().to_dict())
+
+    if figs["forecast"] is None:
         st.info(f"No forecast available for '{symbol}' in the selected date range.")
     else:
-        fig_forecast = px.line(df_forecast, x="DS", y="YHAT", title=f"Forecast — {symbol}")
-        fig_forecast.update_traces(line=dict(color="#4CC9F0", width=2), opacity=1.0)
-        fig_forecast.update_layout(template="plotly_dark", xaxis_title="Date", yaxis_title="Predicted Close")
-        st.plotly_chart(fig_forecast, use_container_width=True)
-
-        # Optional: prediction interval band
-        if {"YHAT_LOWER", "YHAT_UPPER"}.issubset(df_forecast.columns):
-            band = go.Figure()
-            band.add_trace(go.Scatter(
-                x=df_forecast["DS"], y=df_forecast["YHAT_UPPER"],
-                line=dict(color="rgba(76,201,240,0)"),
-                showlegend=False, hoverinfo="skip"
-            ))
-            band.add_trace(go.Scatter(
-                x=df_forecast["DS"], y=df_forecast["YHAT_LOWER"],
-                fill="tonexty", fillcolor="rgba(76,201,240,0.15)",
-                line=dict(color="rgba(76,201,240,0)"),
-                name="Forecast band"
-            ))
-            band.add_trace(go.Scatter(
-                x=df_forecast["DS"], y=df_forecast["YHAT"],
-                line=dict(color="#4CC9F0", width=2),
-                name="Forecast"
-            ))
-            band.update_layout(template="plotly_dark", xaxis_title="Date", yaxis_title="Predicted Close")
-            st.plotly_chart(band, use_container_width=True)
+        st.plotly_chart(figs["forecast"], use_container_width=True, key="forecast")
 
 # Optional: hidden debugging to confirm coverage across symbols
 with st.expander("Debug (table coverage by symbol)", expanded=False):
-    try:
-        df_counts = symbol_counts()
-        st.dataframe(df_counts, use_container_width=True)
-    except Exception as e:
-        st.write("Counts unavailable:", e)
+    st.dataframe(meta[["SRC", "SYMBOL", "N"]], use_container_width=True)
+
+# Speculatively warm the neighbouring symbols at their default range, which is what
+# the per-symbol keyed date picker starts at when the symbol changes. Re-warm once
+# the result TTL has passed, since by then the cached entry has gone cold again.
+# Entries are marked when scheduled (so in-flight warms aren't repeated); the worker
+# restamps them on success and removes them on failure.
+prefetched = st.session_state.setdefault("_prefetched", {})
+now = time.monotonic()
+for args, warmed_at in list(prefetched.items()):
+    if now - warmed_at >= RESULT_CACHE_TTL:
+        prefetched.pop(args, None)  # the worker may have dropped it concurrently
+
+i = symbols.index(symbol)
+to_warm = []
+for neighbour in symbols[max(i - 1, 0):i] + symbols[i + 1:i + 2]:
+    nb_bounds = symbol_bounds(meta, neighbour)
+    if nb_bounds is None:
+        continue
+    nb_args = (neighbour, *default_range(*nb_bounds))
+    if nb_args not in prefetched:
+        to_warm.append(nb_args)
+if to_warm:
+    prefetched.update({args: now for args in to_warm})
+    prefetch_series(to_warm, prefetched)
@@ -102,4 +102,38 @@ SELECT SYMBOL, DS, YHAT, YHAT_LOWER, YHAT_UPPER FROM STOCK_FORECAST;
 
 
 SELECT COUNT(*) FROM STOCK_FORECAST;
-SELECT * FROM STOCK_FORECAST ORDER BY SYMBOL, DS LIMIT 20;
\ No newline at end of file
+SELECT * FROM STOCK_FORECAST ORDER BY SYMBOL, DS LIMIT 20;
+
+-----------------------------------------------------------------------------
+-- Per-symbol metadata for the dashboard (symbol picker, date bounds, coverage)
+-- Materialized views cannot contain UNION, so use a dynamic table refreshed daily.
+
+USE ROLE ACCOUNTADMIN;
+USE WAREHOUSE SNOWFLAKE_LEARNING_WH;
+USE DATABASE SNOWFLAKE_LEARNING_DB;
+USE SCHEMA PUBLIC;
+
+CREATE OR REPLACE DYNAMIC TABLE SYMBOLS_META
+  TARGET_LAG = '1 day'
+  WAREHOUSE = SNOWFLAKE_LEARNING_WH
+AS
+SELECT 'ACTUALS' AS SRC, UPPER(TRIM(SYMBOL)) AS SYMBOL, COUNT(*) AS N, MIN(DT) AS MIN_DS, MAX(DT) AS MAX_DS
+FROM STOCK_SILVER
+GROUP BY 1, 2
+UNION ALL
+SELECT 'FORECAST' AS SRC, UPPER(TRIM(SYMBOL)) AS SYMBOL, COUNT(*) AS N, MIN(DS) AS MIN_DS, MAX(DS) AS MAX_DS
+FROM STOCK_FORECAST
+GROUP BY 1, 2;
+
+SELECT * FROM SYMBOLS_META ORDER BY SYMBOL, SRC;
+
+-----------------------------------------------------------------------------
+-- Cluster by (SYMBOL, date) so the dashboard's per-symbol, per-range queries
+-- prune micro-partitions instead of scanning the whole table.
+
+ALTER TABLE STOCK_SILVER   CLUSTER BY (SYMBOL, DT);
+ALTER TABLE STOCK_FORECAST CLUSTER BY (SYMBOL, DS);
+
+-- Check: partitions scanned should be a small fraction of partitions total
+SELECT SYSTEM$CLUSTERING_INFORMATION('STOCK_SILVER', '(SYMBOL, DT)');
+EXPLAIN SELECT DT, CLOSE FROM STOCK_SILVER WHERE SYMBOL = 'AAPL' AND DT BETWEEN '2016-01-01' AND '2016-12-31';